@@ -8,30 +8,84 @@ Générateur de cartes d'oracles (D&D / JDR Fantastique).
 - Demande à l'utilisateur combien de cartes générer.
 - Vérifie la validité des listes critiques dans la configuration (Robustesse A1).
 - Utilise la distribution de titres définie dans "title_distribution".
+- Tirages reproductibles si la configuration définit une graine "seed" (à modules
+  optionnels identiques : avec ou sans vose, les titres tirés diffèrent).
 - **Produit un fichier texte avec un format encadré (Nouveau)**.
 - Optionnel : produit un DOCX si python-docx est installé.
+- Optionnel : lit la configuration avec orjson s'il est installé.
+- Optionnel : tire les titres pondérés avec vose (méthode d'alias) s'il est installé.
 
 Usage :
     python generate_deck.py [chemin/vers/deck_config.json]
 """
 
+import contextlib
+import functools
+import io
 import json
+import multiprocessing
+import os
 import random
 import sys
+from array import array
+from copy import deepcopy
 from pathlib import Path
-from itertools import chain
-from typing import Any, List, Dict, Union
+from typing import Any, List, Dict, Iterator, NamedTuple, Optional, Sequence
 
 # -----------------------------------------------------
 #  Utilitaire DOCX optionnel
 # -----------------------------------------------------
 try:
     from docx import Document   # Nécessite : pip install python-docx
+    from docx.oxml import OxmlElement, parse_xml
+    from docx.oxml.ns import nsdecls, qn
     from docx.shared import Inches
+    from docx.text.paragraph import Paragraph
+    from lxml import etree   # Dépendance de python-docx
     HAS_DOCX = True
+
+    # Paragraphe prototype (style par défaut, un run de texte), cloné pour chaque
+    # ligne : évite la résolution de style de add_paragraph().
+    _DOCX_TEXT_PARAGRAPH = parse_xml(f'<w:p {nsdecls("w")}><w:r><w:t xml:space="preserve"/></w:r></w:p>')
+    _DOCX_TEXT_PATH = f"{qn('w:r')}/{qn('w:t')}"
 except ImportError:
     HAS_DOCX = False
 
+# -----------------------------------------------------
+#  Lecture JSON accélérée optionnelle
+# -----------------------------------------------------
+try:
+    import orjson   # Nécessite : pip install orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# -----------------------------------------------------
+#  Échantillonnage pondéré optionnel (méthode d'alias de Vose)
+# -----------------------------------------------------
+try:
+    # NumPy n'est requis que par vose (qui attend un tableau de poids) : le reste du
+    # script n'utilise que la bibliothèque standard.
+    import numpy as np
+    from vose import Sampler   # Nécessite : pip install vose
+    HAS_VOSE = True
+except ImportError:
+    HAS_VOSE = False
+
+# Nombre maximal de thèmes ("borders") tirés par carte
+MAX_BORDERS = 12
+
+# Séparateur des champs à plusieurs valeurs (verbes, émotions, traits, thèmes)
+LIST_SEPARATOR = ", "
+
+# Nombre de cartes encodées écrites par appel système dans le fichier texte
+TXT_WRITE_BATCH = 64
+_HAS_WRITEV = hasattr(os, "writev")   # writev() n'existe pas sous Windows
+
+# À partir de combien de cartes le DOCX est rendu en parallèle (et par lots de combien)
+DOCX_PARALLEL_MIN_CARDS = 2000
+DOCX_PARALLEL_CHUNK = 64
+
 # -----------------------------------------------------
 #  Fonctions d'aide et de configuration
 # -----------------------------------------------------
@@ -41,218 +95,455 @@ def load_config(config_path: Path) -> dict:
     if not config_path.is_file():
         raise FileNotFoundError(f"Fichier de configuration introuvable : {config_path}")
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        # orjson et json acceptent tous deux des octets UTF-8 ; les erreurs d'orjson
+        # dérivent de json.JSONDecodeError
+        return _json_loads(config_path.read_bytes())
     except json.JSONDecodeError as e:
         raise ValueError(f"Erreur de décodage JSON dans {config_path}: {e}")
 
 
-def build_title_pool(title_distribution: dict, card_count: int) -> list:
+def build_title_pool(title_distribution: dict, card_count: int, rng: Optional[random.Random] = None) -> list:
     """Construit une liste de titres de longueur 'card_count' selon la distribution."""
+    if rng is None:
+        rng = random.Random()
     items = list(title_distribution.items())
     counts = [int(v) for _, v in items]
     total = sum(counts)
+    titles = [t for t, _ in items]
 
     if total >= card_count:
-        pool = chain.from_iterable([title] * count for (title, _), count in zip(items, counts))
-        pool = list(pool)
-        random.shuffle(pool)
-        return pool[:card_count]
+        # Tirage sans remise dans le multiensemble des titres (équivalent à mélanger
+        # le pool complet puis à le tronquer, sans jamais le construire)
+        return rng.sample(titles, k=card_count, counts=counts)
     else:
-        titles = [t for t, _ in items]
         weights = [float(v) for _, v in items]
-        return random.choices(titles, weights=weights, k=card_count)
-
-
-def pick_multiple(source_list: List[Any], count: int) -> List[Any]:
+        if any(w < 0 for w in weights) or sum(weights) <= 0:
+            raise ValueError(
+                "Les poids de 'title_distribution' doivent être positifs, avec un total supérieur à zéro."
+            )
+        if HAS_VOSE:
+            # Alias de Vose : construction en O(n), puis chaque tirage en O(1)
+            # (graine tirée de rng : le deck reste reproductible)
+            sampler = Sampler(np.asarray(weights, dtype=np.float64), seed=rng.getrandbits(32))
+            # sample(k=1) renvoie un entier seul, pas un tableau
+            return [titles[i] for i in np.atleast_1d(sampler.sample(k=card_count))]
+        return rng.choices(titles, weights=weights, k=card_count)
+
+
+def pick_multiple(source_list: Sequence[Any], count: int, rng: Optional[random.Random] = None) -> List[Any]:
     """Renvoie une liste de 'count' éléments distincts ou avec répétitions."""
+    if rng is None:
+        rng = random.Random()
     if not source_list:
         return []
     if len(source_list) < count:
-        return [random.choice(source_list) for _ in range(count)]
-    return random.sample(source_list, count)
+        _choice = rng.choice
+        return [_choice(source_list) for _ in range(count)]
+    return rng.sample(source_list, count)
 
 
-def _get_random_field_value(cfg: dict, field_key: str, count: int = 1) -> Union[str, List[str]]:
-    """Récupère un champ depuis la config, gère la sélection simple/multiple."""
-    source_list = cfg.get(field_key)
-    
+def _pick_count(pools: Dict[str, tuple], field_key: str, count: int) -> int:
+    """Nombre d'éléments à tirer pour un champ (les thèmes dépendent de la config)."""
+    if field_key == "borders":
+        return min(MAX_BORDERS, len(pools["borders"]))
+    return count
+
+
+class _IndexedColumn:
+    """
+    Colonne d'un champ tirée sous forme d'indices dans son pool (4 octets par tirage
+    au lieu d'une référence de chaîne) ; la valeur n'est lue qu'à l'affichage.
+    """
+    __slots__ = ("pool", "indices")
+
+    def __init__(self, pool: Sequence[str], indices: array):
+        self.pool = pool
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, i: int) -> str:
+        return self.pool[self.indices[i]]
+
+
+class _IndexedListColumn(_IndexedColumn):
+    """
+    Colonne d'un champ à 'width' tirages par carte (indices mis bout à bout) ;
+    la valeur est la jointure (", ") des éléments tirés, recalculée à chaque lecture.
+    """
+    __slots__ = ("width",)
+
+    def __init__(self, pool: Sequence[str], indices: array, width: int):
+        super().__init__(pool, indices)
+        self.width = width
+
+    def __len__(self) -> int:
+        return len(self.indices) // self.width
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self):
+            raise IndexError("index de carte hors limites")
+        pool = self.pool
+        start = i * self.width
+        return LIST_SEPARATOR.join([pool[j] for j in self.indices[start:start + self.width]])
+
+
+def _draw_field_column(
+    source_list: Sequence[Any], count: int, card_count: int, rng: random.Random
+) -> Sequence[str]:
+    """
+    Tire en une seule fois les indices d'un champ pour toutes les cartes du deck.
+    Les champs à tirages multiples sont joints (", ") à la lecture.
+    """
     if not source_list:
-        return "" if count == 1 else []
+        return [""] * card_count
 
+    positions = range(len(source_list))
     if count == 1:
-        return random.choice(source_list)
+        return _IndexedColumn(source_list, array("I", rng.choices(positions, k=card_count)))
     else:
-        return pick_multiple(source_list, count)
+        indices = array("I")
+        for _ in range(card_count):
+            indices.extend(pick_multiple(positions, count, rng))
+        return _IndexedListColumn(source_list, indices, count)
 
 
 # -----------------------------------------------------
 #  Génération de carte
 # -----------------------------------------------------
 
-def generate_card(index: int, title: str, cfg: dict) -> Dict[str, Any]:
+# Champs d'une carte : (clé de la carte, clé du JSON, nombre d'éléments tirés)
+CARD_FIELDS = (
+    ("symbol", "symbols", 1),
+    ("verbs", "table_verbes", 3),
+    ("lieu", "lieux", 1),
+    ("personnage", "personnages", 1),
+    ("objet", "objets", 1),
+    ("emotions", "emotions", 2),
+    ("appearance", "appearances", 1),
+    ("motivation", "motivations", 1),
+    ("traits", "traits", 3),
+    ("secret", "sombres_secrets", 1),
+    ("reaction", "reactions_amical_hostile", 1),
+    ("relation", "relations_pj_pnj", 1),
+    ("borders", "borders", MAX_BORDERS),
+)
+
+
+def build_field_pools(cfg: dict) -> Dict[str, tuple]:
     """
-    Génère une carte sous forme de dict, utilisant uniquement les clés du JSON.
+    Extrait une seule fois de la config les listes utilisées par les cartes,
+    converties en tuples (une liste absente devient un tuple vide).
     """
-    card = {
-        "number": index,
-        "title": title,
-        "symbol": _get_random_field_value(cfg, "symbols"),
-        "verbs": _get_random_field_value(cfg, "table_verbes", 3), 
-        "lieu": _get_random_field_value(cfg, "lieux"),
-        "personnage": _get_random_field_value(cfg, "personnages"),
-        "objet": _get_random_field_value(cfg, "objets"),
-        "emotions": _get_random_field_value(cfg, "emotions", 2),
-        "appearance": _get_random_field_value(cfg, "appearances"),
-        "motivation": _get_random_field_value(cfg, "motivations"),
-        "traits": _get_random_field_value(cfg, "traits", 3),
-        "secret": _get_random_field_value(cfg, "sombres_secrets"), 
-        "reaction": _get_random_field_value(cfg, "reactions_amical_hostile"),
-        "relation": _get_random_field_value(cfg, "relations_pj_pnj"), 
-        "borders": _get_random_field_value(cfg, "borders", min(12, len(cfg.get("borders", [])) or 0))
-    }
-
-    return {k: v for k, v in card.items() if v}
+    return {field_key: tuple(cfg.get(field_key) or ()) for _, field_key, _ in CARD_FIELDS}
 
 
-# -----------------------------------------------------
-#  Fonctions d'enregistrement et d'affichage
-# -----------------------------------------------------
+# Une colonne par clé de carte ("number", "title", puis les champs de CARD_FIELDS)
+DeckColumns = Dict[str, Sequence[Any]]
 
-def format_card_as_text(card: dict) -> str:
+
+def generate_cards(
+    title_pool: List[str], pools: Dict[str, tuple], rng: Optional[random.Random] = None
+) -> DeckColumns:
     """
-    **Retourne une chaîne de caractères formatée en boîte encadrée d'astérisques.**
+    Génère toutes les cartes du deck, rangées par colonnes (une colonne par champ) :
+    la carte i est formée des i-èmes valeurs de chaque colonne.
     """
-    # 1. Préparation des lignes de contenu (format "Label : Value")
-    content_lines = []
-    
-    # Titre principal
-    content_lines.append(f"Carte {card.get('number')} — {card.get('title', '')}")
-
-    fields = [
-        ("symbol", "Symbole", ""), ("verbs", "Verbes", ", "), ("lieu", "Lieu", ""), 
-        ("personnage", "Personnage", ""), ("objet", "Objet", ""), ("emotions", "Émotions", ", "), 
-        ("appearance", "Apparence", ""), ("motivation", "Motivation", ""), 
-        ("traits", "Traits", ", "), ("secret", "Secret", ""), ("relation", "Relation", "")
-    ]
-    
-    for key, label, separator in fields:
-        value = card.get(key)
-        if value:
-            if isinstance(value, list):
-                content_lines.append(f"{label} : {separator.join(value)}")
-            else:
-                content_lines.append(f"{label} : {value}")
-
-    if card.get("reaction"):
-        # Le format d'affichage doit correspondre exactement à celui de l'utilisateur
-        content_lines.append(f"Réaction (amical/hostile) : {card['reaction']}")
-
-    if card.get("borders"):
-        content_lines.append(f"Thèmes : {', '.join(card['borders'])}")
-    
-    if not content_lines:
-        return ""
+    if rng is None:
+        rng = random.Random()
+    card_count = len(title_pool)
+    columns = {"number": range(1, card_count + 1), "title": title_pool}
+    for card_key, field_key, count in CARD_FIELDS:
+        columns[card_key] = _draw_field_column(
+            pools[field_key], _pick_count(pools, field_key, count), card_count, rng
+        )
+    return columns
 
-    # 2. Détermination de la longueur maximale et du cadre
-    max_len = max(len(line) for line in content_lines)
-    
+
+def card_count_of(columns: DeckColumns) -> int:
+    """Nombre de cartes d'un deck rangé par colonnes."""
+    return len(columns["number"])
+
+
+# Une carte du deck : numéro, titre puis les champs de CARD_FIELDS, dans cet ordre
+# (un champ vide vaut "")
+Card = NamedTuple(
+    "Card", [("number", int), ("title", str)] + [(card_key, str) for card_key, _, _ in CARD_FIELDS]
+)
+
+
+def card_at(columns: DeckColumns, i: int) -> Card:
+    """Assemble la i-ème carte (à partir de 0) directement depuis les colonnes du deck."""
+    return Card._make([columns[key][i] for key in Card._fields])
+
+
+def iter_cards(columns: DeckColumns) -> Iterator[Card]:
+    """Parcourt les cartes du deck une à une, chacune n'étant construite qu'à la demande."""
+    for i in range(card_count_of(columns)):
+        yield card_at(columns, i)
+
+
+# -----------------------------------------------------
+#  Fonctions d'enregistrement et d'affichage
+# -----------------------------------------------------
+
+# Gabarits précompilés du format texte : (clé de la carte, gabarit)
+_TITLE_TEMPLATE = "Carte {} — {}".format
+_FIELD_TEMPLATES = (
+    ("symbol", "Symbole : {}".format),
+    ("verbs", "Verbes : {}".format),
+    ("lieu", "Lieu : {}".format),
+    ("personnage", "Personnage : {}".format),
+    ("objet", "Objet : {}".format),
+    ("emotions", "Émotions : {}".format),
+    ("appearance", "Apparence : {}".format),
+    ("motivation", "Motivation : {}".format),
+    ("traits", "Traits : {}".format),
+    ("secret", "Secret : {}".format),
+    ("relation", "Relation : {}".format),
+    # Le format d'affichage doit correspondre exactement à celui de l'utilisateur
+    ("reaction", "Réaction (amical/hostile) : {}".format),
+    ("borders", "Thèmes : {}".format),
+)
+
+
+# Bourrages d'espaces précalculés pour les longueurs courantes
+_PAD_CACHE_SIZE = 256
+_PAD = [" " * n for n in range(_PAD_CACHE_SIZE)]
+
+
+@functools.lru_cache(maxsize=64)
+def _border(box_width: int) -> str:
+    """Ligne d'astérisques du haut/bas d'une boîte (peu de largeurs distinctes par deck)."""
+    return "*" * box_width
+
+
+def _frame_lines(content_lines: List[str], max_len: int) -> str:
+    """Encadre des lignes de contenu d'astérisques ('max_len' : la plus longue)."""
     # Largeur de la boîte : longueur max + 2 espaces de chaque côté + 2 astérisques (total + 4)
     box_width = max_len + 4 
     
-    top_bottom_line = "*" * box_width
+    top_bottom_line = _border(box_width)
     
-    # 3. Construction de la carte encadrée
-    boxed_lines = [top_bottom_line]
+    # Construction de la carte encadrée, directement dans un tampon
+    buffer = io.StringIO()
+    write = buffer.write
+    write(top_bottom_line)
+    write("\n")
     
     for line in content_lines:
         # Calcul du padding pour aligner à droite
         # On utilise un espace de padding de 2, donc (box_width - len(line) - 2 astérisques) / 2
         # Pour une boîte parfaite, on fait : (longueur totale de la ligne - longueur du contenu - 2)
-        padding = " " * (max_len - len(line))
+        pad_len = max_len - len(line)
+        padding = _PAD[pad_len] if pad_len < _PAD_CACHE_SIZE else " " * pad_len
         # Format: *Ligne de contenu + padding*
-        boxed_lines.append(f"*{line}{padding} *")
+        write(f"*{line}{padding} *\n")
 
-    boxed_lines.append(top_bottom_line)
+    write(top_bottom_line)
     
     # Ajout d'une ligne vide à la fin pour la séparation entre les cartes
-    return "\n".join(boxed_lines) + "\n"
+    write("\n")
+    return buffer.getvalue()
 
 
+def _compile_card_lines():
+    """
+    Génère, à partir de _FIELD_TEMPLATES, une fonction spécialisée qui renvoie les lignes
+    de contenu de la i-ème carte du deck en colonnes et la longueur de la plus longue :
+    la séquence des champs est déroulée dans le code, sans boucle par champ.
+    """
+    namespace = {"_title": _TITLE_TEMPLATE}
+    src = [
+        "def _card_lines(i, columns):",
+        '    line = _title(columns["number"][i], columns["title"][i])',
+        "    lines = [line]",
+        "    max_len = len(line)",
+    ]
+    for n, (key, template) in enumerate(_FIELD_TEMPLATES):
+        namespace[f"_t{n}"] = template
+        src += [
+            f"    v = columns[{key!r}][i]",
+            "    if v:",
+            f"        line = _t{n}(v)",
+            "        lines.append(line)",
+            "        if len(line) > max_len:",
+            "            max_len = len(line)",
+        ]
+    src.append("    return lines, max_len")
+    exec("\n".join(src), namespace)
+    return namespace["_card_lines"]
+
+
+# Lignes de contenu (format "Label : Value") de la i-ème carte du deck en colonnes
+# (les champs multiples sont joints à la lecture de leur colonne)
+_card_lines = _compile_card_lines()
+
+
+def format_card_as_text_soa(i: int, columns: DeckColumns) -> str:
+    """
+    **Retourne la i-ème carte du deck (rangé par colonnes) formatée en boîte encadrée
+    d'astérisques.**
+    """
+    return _frame_lines(*_card_lines(i, columns))
+
+
+# Dossiers et extensions où chercher les images de symboles (calculés une seule fois)
+_SYMBOL_IMAGE_BASES = (Path.cwd() / "symbols", Path.cwd())
+_SYMBOL_IMAGE_EXTS = (".jpg", ".png", ".jpeg", ".webp")
+
+
+@functools.lru_cache(maxsize=None)
 def _find_symbol_image(symbol: str):
-    """Recherche d'images pour le docx (inchangée)."""
-    candidates = []
-    for base in (Path.cwd() / "symbols", Path.cwd()):
-        for ext in (".jpg", ".png", ".jpeg", ".webp"):
-            candidates.append(base / f"{symbol}{ext}")
-    for p in candidates:
-        if p.is_file():
-            return p
+    """Recherche d'images pour le docx (résultat mémorisé par symbole)."""
+    for base in _SYMBOL_IMAGE_BASES:
+        for ext in _SYMBOL_IMAGE_EXTS:
+            p = base / f"{symbol}{ext}"
+            if p.is_file():
+                return p
     return None
 
 
-def save_as_txt(cards: List[dict], output_path: str):
-    """Enregistre toutes les cartes dans un fichier texte."""
+def _write_batch(fd: int, batch: List[bytes]):
+    """Écrit un lot de blocs d'octets, en un seul appel système (writev) si possible."""
+    if _HAS_WRITEV:
+        written = os.writev(fd, batch)
+        data = b"".join(batch)[written:] if written < sum(map(len, batch)) else b""
+    else:
+        data = b"".join(batch)
+    # Écriture partielle (rare sur un fichier) : on termine avec write()
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def save_as_txt(columns: DeckColumns, output_path: str):
+    """Enregistre toutes les cartes dans un fichier texte, carte par carte."""
     path = Path(output_path)
-    content = []
     deck_title = "LE TAROT DES ROYAUMES OUBLIÉS — DECK GÉNÉRÉ"
-    content.append(deck_title + "\n")
-    content.append("=" * len(deck_title) + "\n")
 
-    for card in cards:
-        # Utilisation de la fonction formatée
-        content.append(format_card_as_text(card))
+    # Écriture au fil de l'eau, par lots de cartes déjà encodées : pas de chaîne géante
+    # en mémoire, et un appel système par lot plutôt que par carte
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        batch = [(deck_title + "\n" + "\n" + "=" * len(deck_title) + "\n").encode("utf-8")]
+
+        for i in range(card_count_of(columns)):
+            # Utilisation de la fonction formatée (une ligne vide sépare les blocs)
+            batch.append(("\n" + format_card_as_text_soa(i, columns)).encode("utf-8"))
+            if len(batch) >= TXT_WRITE_BATCH:
+                _write_batch(fd, batch)
+                batch = []
+
+        if batch:
+            _write_batch(fd, batch)
+    finally:
+        os.close(fd)
 
-    path.write_text("\n".join(content), encoding="utf-8")
     print(f"[OK] Fichier texte généré : {path}")
 
 
-def save_as_docx(cards: List[dict], output_path: str):
+def _docx_text_paragraph(text: str):
+    """Clone le paragraphe prototype avec le texte donné."""
+    p = deepcopy(_DOCX_TEXT_PARAGRAPH)
+    p.find(_DOCX_TEXT_PATH).text = text
+    return p
+
+
+@functools.lru_cache(maxsize=None)
+def _docx_heading_prototype(style_id: str):
+    """Paragraphe prototype d'un titre (style de paragraphe déjà résolu en identifiant)."""
+    p = deepcopy(_DOCX_TEXT_PARAGRAPH)
+    p.insert(0, parse_xml(f'<w:pPr {nsdecls("w")}><w:pStyle w:val="{style_id}"/></w:pPr>'))
+    return p
+
+
+def _render_card_docx_xml(heading_style_id: str, card: Card) -> bytes:
+    """
+    Sérialise tous les paragraphes d'une carte (titre, symbole, champs, ligne vide).
+    Fonction autonome (sans Document) : elle peut tourner dans un processus séparé.
+    Si le symbole a une image, son paragraphe est laissé vide pour que
+    save_as_docx y ajoute l'image.
+    """
+    fragment = OxmlElement("w:body")
+
+    def add_text(text: str):
+        fragment.append(_docx_text_paragraph(text))
+
+    heading = deepcopy(_docx_heading_prototype(heading_style_id))
+    heading.find(_DOCX_TEXT_PATH).text = f"{card.number} :  {card.title}"
+    fragment.append(heading)
+
+    # Logique d'ajout du Symbole
+    symbol = card.symbol
+    if symbol and _find_symbol_image(symbol) is not None:
+        fragment.append(OxmlElement("w:p"))
+    else:
+        add_text(f"Symbole : {symbol}")
+
+    # Ajout des champs (simplifiés)
+    if card.verbs:
+        add_text(f"Action(s) centrale(s) : {card.verbs}")
+    if card.lieu:
+        add_text(f"Lieu : {card.lieu}")
+    if card.personnage:
+        add_text(f"Personnage : {card.personnage}")
+    if card.objet:
+        add_text(f"Objet : {card.objet}")
+    if card.motivation:
+        add_text(f"Motivation : {card.motivation}")
+    if card.traits:
+        add_text(f"Caractère : {card.traits}")
+    if card.secret:
+        add_text(f"Secret : {card.secret}")
+    if card.relation:
+        add_text(f"Relation : {card.relation}")
+
+    if card.reaction:
+        add_text(f"Réaction (amical/hostile) : {card.reaction}")
+
+    if card.borders:
+        add_text(f"Thèmes dominants : {card.borders}")
+
+    # Paragraphe vide de séparation
+    fragment.append(OxmlElement("w:p"))
+    return etree.tostring(fragment)
+
+
+def save_as_docx(columns: DeckColumns, output_path: str):
     """Enregistre toutes les cartes dans un fichier DOCX."""
     if not HAS_DOCX:
         print("[INFO] python-docx n’est pas installé, DOCX non généré.")
         return
 
     doc = Document()
-    
-    for card in cards:
-        doc.add_heading(f"{card['number']} :  {card['title']}", level=2)
-
-        # Logique d'ajout du Symbole
-        symbol = card.get("symbol", "")
-        img_path = _find_symbol_image(symbol) if symbol else None
-        if img_path is not None:
-            p = doc.add_paragraph()
-            r = p.add_run("")
-            r.add_picture(str(img_path), width=Inches(0.52))
+    body = doc.element.body
+
+    # Les paragraphes se placent avant les propriétés de section (w:sectPr), en fin de corps
+    sect_pr = body.find(qn("w:sectPr"))
+    insert = sect_pr.addprevious if sect_pr is not None else body.append
+
+    # Chaque carte est sérialisée indépendamment du Document, en parallèle pour les grands
+    # decks ; seules les images des symboles sont ajoutées ensuite via python-docx.
+    # Les cartes sont produites à la volée (aucune liste complète de dicts) et les
+    # fragments reviennent dans l'ordre du deck.
+    render = functools.partial(_render_card_docx_xml, doc.styles["Heading 2"].style_id)
+    parallel = card_count_of(columns) >= DOCX_PARALLEL_MIN_CARDS
+    with multiprocessing.Pool() if parallel else contextlib.nullcontext() as pool:
+        if parallel:
+            fragments = pool.imap(render, iter_cards(columns), chunksize=DOCX_PARALLEL_CHUNK)
         else:
-            doc.add_paragraph(f"Symbole : {symbol}")
-
-        # Ajout des champs (simplifiés)
-        if card.get("verbs"):
-            doc.add_paragraph(f"Action(s) centrale(s) : {', '.join(card['verbs'])}")
-        if card.get("lieu"):
-            doc.add_paragraph(f"Lieu : {card['lieu']}")
-        if card.get("personnage"):
-            doc.add_paragraph(f"Personnage : {card['personnage']}")
-        if card.get("objet"):
-            doc.add_paragraph(f"Objet : {card['objet']}")
-        if card.get("motivation"):
-            doc.add_paragraph(f"Motivation : {card['motivation']}")
-        if card.get("traits"):
-            doc.add_paragraph(f"Caractère : {', '.join(card['traits'])}")
-        if card.get("secret"):
-            doc.add_paragraph(f"Secret : {card['secret']}")
-        if card.get("relation"):
-            doc.add_paragraph(f"Relation : {card['relation']}")
-
-        if card.get("reaction"):
-            doc.add_paragraph(f"Réaction (amical/hostile) : {card['reaction']}")
-
-        if card.get("borders"):
-            doc.add_paragraph(f"Thèmes dominants : {', '.join(card['borders'])}")
-
-        doc.add_paragraph("")
+            fragments = map(render, iter_cards(columns))
+
+        for symbol, fragment in zip(columns["symbol"], fragments):
+            paragraphs = list(parse_xml(fragment))
+            for p in paragraphs:
+                insert(p)
+
+            img_path = _find_symbol_image(symbol) if symbol else None
+            if img_path is not None:
+                r = Paragraph(paragraphs[1], doc).add_run("")
+                r.add_picture(str(img_path), width=Inches(0.52))
 
     path = Path(output_path)
     doc.save(path)
@@ -278,22 +569,22 @@ def _prompt_for_card_count(default_count: int) -> int:
             print("[ATTENTION] Entrée invalide. Veuillez entrer un nombre entier positif.")
 
 
+# Listes essentielles de la configuration (l'ordre sert aux messages d'erreur)
+REQUIRED_KEYS = (
+    "title_distribution", "symbols", "table_verbes", "lieux", 
+    "personnages", "objets", "motivations", "traits", 
+    "sombres_secrets", "reactions_amical_hostile", "relations_pj_pnj"
+)
+_REQUIRED_KEY_SET = frozenset(REQUIRED_KEYS)
+
+
 def check_critical_lists(cfg: dict):
     """Vérifie que les listes essentielles existent et ne sont pas vides."""
-    required_keys = [
-        "title_distribution", "symbols", "table_verbes", "lieux", 
-        "personnages", "objets", "motivations", "traits", 
-        "sombres_secrets", "reactions_amical_hostile", "relations_pj_pnj"
-    ]
-    
-    missing_keys = []
-    empty_keys = []
-    
-    for key in required_keys:
-        if key not in cfg:
-            missing_keys.append(key)
-        elif not cfg.get(key) or (isinstance(cfg.get(key), (list, dict)) and not cfg.get(key)):
-            empty_keys.append(key)
+    missing = _REQUIRED_KEY_SET - cfg.keys()
+    empty = {key for key in _REQUIRED_KEY_SET - missing if not cfg[key]}
+
+    missing_keys = [key for key in REQUIRED_KEYS if key in missing]
+    empty_keys = [key for key in REQUIRED_KEYS if key in empty]
 
     if missing_keys or empty_keys:
         error_msg = "[ERREUR FATALE] La configuration JSON est incomplète ou vide :\n"
@@ -318,23 +609,27 @@ def main():
         # Vérification de la configuration critique
         check_critical_lists(cfg)
 
+        # Générateur aléatoire local, partagé par tous les tirages ; une graine
+        # "seed" dans la config rend le deck reproductible
+        seed = cfg.get("seed")
+        if seed is not None and not isinstance(seed, (int, str)):
+            raise ValueError(f"La graine 'seed' doit être un entier ou une chaîne, pas : {seed!r}")
+        rng = random.Random(seed)
+
         # Demander le nombre de cartes
         default_count = int(cfg.get("card_count", 100))
         card_count = _prompt_for_card_count(default_count)
 
         # Construction du pool de titres
-        title_pool = build_title_pool(cfg["title_distribution"], card_count)
+        title_pool = build_title_pool(cfg["title_distribution"], card_count, rng)
 
     except (FileNotFoundError, ValueError) as e:
         print(f"\n[ERREUR] Impossible de lancer le générateur :\n{e}")
         sys.exit(1)
 
     # Génération des cartes
-    cards = []
-    for i in range(1, card_count + 1):
-        title = title_pool[i - 1]
-        card = generate_card(i, title, cfg)
-        cards.append(card)
+    pools = build_field_pools(cfg)
+    columns = generate_cards(title_pool, pools, rng)
 
     # Sorties
     out_cfg = cfg.get("output", {})
@@ -342,10 +637,10 @@ def main():
     docx_file = out_cfg.get("docx_file", "deck_oracle.docx")
     create_docx = bool(out_cfg.get("create_docx", True))
 
-    save_as_txt(cards, txt_file)
+    save_as_txt(columns, txt_file)
 
     if create_docx:
-        save_as_docx(cards, docx_file)
+        save_as_docx(columns, docx_file)
 
 
 if __name__ == "__main__":